@@ -1,9 +1,28 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.conf import settings
+from django.db import transaction
 from .models import CustomUser, UserProfile, AIAgentConfig, SubscriptionHistory, PaymentRequest
-from .emails import send_kyc_approved_email, send_kyc_rejected_email, send_payment_approved_email, send_payment_rejected_email
+from .emails import (
+    build_kyc_approved_email, build_kyc_rejected_email, build_payment_approved_email, build_payment_rejected_email,
+    send_bulk_emails_in_background,
+)
+from .stats import invalidate_admin_stats
+from .paginators import EstimatedCountPaginator
+
+DEFAULT_KYC_REJECTION_REASON = 'Your KYC submission did not meet our requirements. Please re-submit with clear, high-resolution images of a valid NID or Passport.'
+
+# HTML snippets used by the KYC document columns / previews
+KYC_LINK_HTML = '<a href="{}" target="_blank">{}</a>'
+KYC_PREVIEW_HTML = '<img src="{}" style="max-width:300px; max-height:200px;" />'
+
+
+def _is_changelist_request(request, opts):
+    """True when the request targets this model's changelist page (listing and bulk actions)."""
+    match = getattr(request, 'resolver_match', None)
+    return match is not None and match.url_name == f'{opts.app_label}_{opts.model_name}_changelist'
 
 
 class CustomUserAdmin(UserAdmin):
@@ -40,60 +59,93 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['kyc_status', 'package_name']
     actions = ['approve_kyc', 'reject_kyc', 'assign_7_days', 'assign_15_days', 'assign_30_days']
     readonly_fields = ['kyc_front_preview', 'kyc_back_preview']
+    # Search users on demand instead of rendering every user into a <select>
+    autocomplete_fields = ['user']
     inlines = [SubscriptionHistoryInline]
+    paginator = EstimatedCountPaginator
+    # Otherwise the changelist runs its own unfiltered COUNT(*) next to the paginator's
+    show_full_result_count = False
+    # Columns the changelist actually renders; everything else is deferred there
+    changelist_only_fields = [
+        'id', 'user__email', 'kyc_status', 'package_name', 'subscription_expiry', 'kyc_front_image', 'kyc_back_image',
+    ]
+
+    def get_queryset(self, request):
+        # Join the user row so list_display doesn't fire one query per profile
+        queryset = super().get_queryset(request).select_related('user')
+        if _is_changelist_request(request, self.opts):
+            queryset = queryset.only(*self.changelist_only_fields)
+        return queryset
     
     def kyc_document_links(self, obj):
-        from django.utils.html import format_html
-        from django.utils.safestring import mark_safe
         links = []
         if obj.kyc_front_image:
-            links.append(format_html('<a href="{}" target="_blank">Front</a>', obj.kyc_front_image.url))
+            links.append(format_html(KYC_LINK_HTML, obj.kyc_front_image.url, 'Front'))
         if obj.kyc_back_image:
-            links.append(format_html('<a href="{}" target="_blank">Back</a>', obj.kyc_back_image.url))
+            links.append(format_html(KYC_LINK_HTML, obj.kyc_back_image.url, 'Back'))
         return mark_safe(" | ".join(links)) if links else "No documents"
     kyc_document_links.short_description = "KYC Documents"
     
     def kyc_front_preview(self, obj):
-        from django.utils.html import format_html
         if obj.kyc_front_image:
-            return format_html('<img src="{}" style="max-width:300px; max-height:200px;" />', obj.kyc_front_image.url)
+            return format_html(KYC_PREVIEW_HTML, obj.kyc_front_image.url)
         return "No front image uploaded"
     kyc_front_preview.short_description = "Front ID Preview"
 
     def kyc_back_preview(self, obj):
-        from django.utils.html import format_html
         if obj.kyc_back_image:
-            return format_html('<img src="{}" style="max-width:300px; max-height:200px;" />', obj.kyc_back_image.url)
+            return format_html(KYC_PREVIEW_HTML, obj.kyc_back_image.url)
         return "No back image uploaded"
     kyc_back_preview.short_description = "Back ID Preview"
     
     @admin.action(description="✅ Approve KYC Verification")
     def approve_kyc(self, request, queryset):
-        # Collect IDs first, then bulk-update, then re-fetch fresh profiles
-        user_ids = list(queryset.values_list('id', flat=True))
-        updated_count = queryset.update(kyc_status='VERIFIED', kyc_rejection_reason='')
+        # Load just what the email needs up front; the UPDATE doesn't change those
+        # columns, so there's no need to re-fetch the profiles afterwards
+        profiles = list(queryset.select_related('user').only('id', 'name', 'user__email'))
+
+        if not profiles:
+            self.message_user(request, "No users selected.", level='WARNING')
+            return
+
+        user_ids = [profile.pk for profile in profiles]
+        updated_count = UserProfile.objects.filter(id__in=user_ids).update(kyc_status='VERIFIED', kyc_rejection_reason='')
 
-        # Re-fetch profiles so we have fresh data after the bulk update
-        for profile in UserProfile.objects.filter(id__in=user_ids).select_related('user'):
-            send_kyc_approved_email(profile)
+        messages = [build_kyc_approved_email(profile) for profile in profiles]
+        transaction.on_commit(lambda: send_bulk_emails_in_background(messages))
 
+        invalidate_admin_stats()
         self.message_user(request, f"{updated_count} user(s) KYC approved and notified by email.")
     approve_kyc.short_description = "✅ Approve KYC Verification"
     
     @admin.action(description="❌ Reject KYC Verification")
     def reject_kyc(self, request, queryset):
-        # Collect IDs first, then bulk-update, then re-fetch fresh profiles
-        user_ids = list(queryset.values_list('id', flat=True))
-        updated_count = queryset.update(kyc_status='REJECTED')
-
-        # Re-fetch profiles so we have fresh data (including any kyc_rejection_reason set elsewhere)
-        for profile in UserProfile.objects.filter(id__in=user_ids).select_related('user'):
-            # Set a default reason if none was provided
-            if not profile.kyc_rejection_reason:
-                profile.kyc_rejection_reason = 'Your KYC submission did not meet our requirements. Please re-submit with clear, high-resolution images of a valid NID or Passport.'
-                profile.save(update_fields=['kyc_rejection_reason'])
-            send_kyc_rejected_email(profile)
+        # Load just what the email needs up front, then mirror the default-reason
+        # backfill in memory instead of re-fetching the profiles after the UPDATEs
+        profiles = list(queryset.select_related('user').only('id', 'name', 'kyc_rejection_reason', 'user__email'))
 
+        if not profiles:
+            self.message_user(request, "No users selected.", level='WARNING')
+            return
+
+        user_ids = [profile.pk for profile in profiles]
+
+        # Both UPDATEs commit together; emails go out only once they have
+        with transaction.atomic():
+            updated_count = UserProfile.objects.filter(id__in=user_ids).update(kyc_status='REJECTED')
+
+            # Set a default reason (in one UPDATE) wherever none was provided
+            UserProfile.objects.filter(id__in=user_ids, kyc_rejection_reason='').update(
+                kyc_rejection_reason=DEFAULT_KYC_REJECTION_REASON
+            )
+            for profile in profiles:
+                if not profile.kyc_rejection_reason:
+                    profile.kyc_rejection_reason = DEFAULT_KYC_REJECTION_REASON
+
+            messages = [build_kyc_rejected_email(profile) for profile in profiles]
+            transaction.on_commit(lambda: send_bulk_emails_in_background(messages))
+
+        invalidate_admin_stats()
         self.message_user(request, f"{updated_count} user(s) KYC rejected and notified by email.")
     reject_kyc.short_description = "❌ Reject KYC Verification"
     
@@ -102,20 +154,33 @@ class UserProfileAdmin(admin.ModelAdmin):
         from datetime import timedelta
         
         expiry_date = timezone.now() + timedelta(days=days)
-        
-        updated_count = 0
-        for profile in queryset:
+
+        # Set fields in memory, then write everything in two bulk queries
+        profiles = list(queryset)
+
+        if not profiles:
+            self.message_user(request, "No users selected.", level='WARNING')
+            return
+
+        for profile in profiles:
             profile.subscription_expiry = expiry_date
             profile.package_name = package_name
-            profile.save()
-            
-            # Create history record
-            SubscriptionHistory.objects.create(
-                profile=profile,
-                package_name=package_name,
-                expiry_date=expiry_date
-            )
-            updated_count += 1
+
+        # One commit for the profile UPDATE and the history INSERT
+        with transaction.atomic():
+            UserProfile.objects.bulk_update(profiles, ['subscription_expiry', 'package_name'], batch_size=500)
+
+            # Create history records
+            SubscriptionHistory.objects.bulk_create([
+                SubscriptionHistory(
+                    profile=profile,
+                    package_name=package_name,
+                    expiry_date=expiry_date
+                )
+                for profile in profiles
+            ], batch_size=500)
+        updated_count = len(profiles)
+        invalidate_admin_stats()
             
         self.message_user(request, f"{updated_count} users assigned {package_name} package.")
     
@@ -137,7 +202,23 @@ class PaymentRequestAdmin(admin.ModelAdmin):
     list_display = ['user', 'package_name', 'amount', 'payment_method', 'transaction_id', 'status', 'created_at']
     list_filter = ['status', 'payment_method', 'package_name']
     search_fields = ['user__email', 'transaction_id']
+    autocomplete_fields = ['user']
     actions = ['approve_payment', 'reject_payment']
+    paginator = EstimatedCountPaginator
+    # Otherwise the changelist runs its own unfiltered COUNT(*) next to the paginator's
+    show_full_result_count = False
+    # Columns the changelist actually renders; everything else is deferred there
+    changelist_only_fields = [
+        'id', 'user__email', 'package_name', 'amount', 'payment_method', 'transaction_id', 'status', 'created_at',
+    ]
+
+    def get_queryset(self, request):
+        # Join the user row so the user column doesn't fire one query per payment
+        queryset = super().get_queryset(request).select_related('user')
+        if _is_changelist_request(request, self.opts):
+            # Listing and bulk actions (the actions re-fetch what they need)
+            return queryset.only(*self.changelist_only_fields)
+        return queryset
 
     @admin.action(description="✅ Approve Selected Payments")
     def approve_payment(self, request, queryset):
@@ -152,35 +233,46 @@ class PaymentRequestAdmin(admin.ModelAdmin):
             self.message_user(request, "No pending payments selected.", level='WARNING')
             return
 
-        updated_count = pending_requests.update(status='APPROVED')
+        # Status change, profile extensions and history rows commit together
+        with transaction.atomic():
+            updated_count = pending_requests.update(status='APPROVED')
 
-        now = timezone.now()
-        for payment in PaymentRequest.objects.filter(id__in=payment_ids).select_related('user__profile'):
-            profile = payment.user.profile
-            days = 0
-            if '15' in payment.package_name:
-                days = 15
-            elif '30' in payment.package_name:
-                days = 30
+            now = timezone.now()
+            messages = []
+            # Changes are collected in memory and written with two bulk queries after the loop.
+            # Keyed by pk so several payments from the same user stack on one profile.
+            profiles_to_update = {}
+            histories_to_create = []
+            payments = PaymentRequest.objects.filter(id__in=payment_ids).select_related('user__profile')
+            for payment in payments:
+                profile = profiles_to_update.get(payment.user.profile.pk, payment.user.profile)
+                days = PaymentRequest.PACKAGE_DAYS.get(payment.package_name, 0)
             
-            if days > 0:
-                # Extend from current expiry or now
-                if profile.subscription_expiry and profile.subscription_expiry > now:
-                    new_expiry = profile.subscription_expiry + timedelta(days=days)
-                else:
-                    new_expiry = now + timedelta(days=days)
+                if days > 0:
+                    # Extend from current expiry or now
+                    if profile.subscription_expiry and profile.subscription_expiry > now:
+                        new_expiry = profile.subscription_expiry + timedelta(days=days)
+                    else:
+                        new_expiry = now + timedelta(days=days)
                 
-                profile.subscription_expiry = new_expiry
-                profile.package_name = payment.package_name
-                profile.save(update_fields=['subscription_expiry', 'package_name'])
+                    profile.subscription_expiry = new_expiry
+                    profile.package_name = payment.package_name
+                    profiles_to_update[profile.pk] = profile
                 
-                SubscriptionHistory.objects.create(
-                    profile=profile,
-                    package_name=payment.package_name,
-                    expiry_date=new_expiry
-                )
+                    histories_to_create.append(SubscriptionHistory(
+                        profile=profile,
+                        package_name=payment.package_name,
+                        expiry_date=new_expiry
+                    ))
             
-            send_payment_approved_email(payment)
+                messages.append(build_payment_approved_email(payment))
+
+            UserProfile.objects.bulk_update(
+                profiles_to_update.values(), ['subscription_expiry', 'package_name'], batch_size=500
+            )
+            SubscriptionHistory.objects.bulk_create(histories_to_create, batch_size=500)
+            transaction.on_commit(lambda: send_bulk_emails_in_background(messages))
+        invalidate_admin_stats()
             
         self.message_user(request, f"{updated_count} payment(s) approved. Subscriptions updated and emails sent.")
 
@@ -195,8 +287,10 @@ class PaymentRequestAdmin(admin.ModelAdmin):
 
         updated_count = pending_requests.update(status='REJECTED')
 
-        for payment in PaymentRequest.objects.filter(id__in=payment_ids).select_related('user'):
-            send_payment_rejected_email(payment)
+        payments = PaymentRequest.objects.filter(id__in=payment_ids).select_related('user__profile')
+        messages = [build_payment_rejected_email(payment) for payment in payments]
+        transaction.on_commit(lambda: send_bulk_emails_in_background(messages))
+        invalidate_admin_stats()
             
         self.message_user(request, f"{updated_count} payment(s) rejected and emails sent.")
 
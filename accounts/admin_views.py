@@ -1,17 +1,62 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.db import transaction
 import json
 from django.db.models import Count, Q, Sum
 from django.db.models.functions import TruncDate
 from django.utils import timezone
-from django.core.paginator import Paginator
+from django.core.cache import cache
 from .models import CustomUser, UserProfile, AIAgentConfig, PaymentRequest
+from .paginators import EstimatedCountPaginator
+from .stats import (
+    ADMIN_STATS_CACHE_TIMEOUT, DASHBOARD_STATS_CACHE_KEY, SUBSCRIPTION_STATS_CACHE_KEY, invalidate_admin_stats,
+)
 
 # Check if user is superuser
 def is_superuser(user):
     return user.is_superuser
 
+
+def _get_dashboard_stats():
+    """Compute the overview counts shown on the admin dashboard."""
+    now = timezone.now()
+
+    # One conditional aggregate per table instead of a COUNT query per stat
+    user_stats = CustomUser.objects.aggregate(
+        total=Count('id'),
+        new_today=Count('id', filter=Q(date_joined__date=now.date())),
+    )
+    profile_stats = UserProfile.objects.aggregate(
+        pending_kyc=Count('id', filter=Q(kyc_status='PENDING')),
+        active_subscriptions=Count('id', filter=Q(subscription_expiry__gt=now)),
+    )
+    return {
+        'total_users': user_stats['total'],
+        'new_users_today': user_stats['new_today'],
+        'pending_kyc': profile_stats['pending_kyc'],
+        'pending_payments': PaymentRequest.objects.filter(status='PENDING').count(),
+        'total_ai_agents': AIAgentConfig.objects.count(),
+        'active_subscriptions': profile_stats['active_subscriptions'],
+    }
+
+
+def _get_subscription_stats():
+    """Compute the subscription bucket counts shown on the subscription page."""
+    now = timezone.now()
+
+    # All four buckets in a single pass over the table
+    return UserProfile.objects.aggregate(
+        total_active=Count('id', filter=Q(subscription_expiry__gt=now)),
+        expiring_soon=Count('id', filter=Q(
+            subscription_expiry__gt=now,
+            subscription_expiry__lte=now + timezone.timedelta(days=7)
+        )),
+        total_expired=Count('id', filter=Q(subscription_expiry__lte=now)),
+        never_subscribed=Count('id', filter=Q(subscription_expiry__isnull=True)),
+    )
+
+
 @login_required
 @user_passes_test(is_superuser)
 def admin_dashboard(request):
@@ -19,23 +64,14 @@ def admin_dashboard(request):
     Main Admin Dashboard View
     Displays overview statistics and recent activity.
     """
-    total_users = CustomUser.objects.count()
-    new_users_today = CustomUser.objects.filter(date_joined__date=timezone.now().date()).count()
-    pending_kyc = UserProfile.objects.filter(kyc_status='PENDING').count()
-    pending_payments = PaymentRequest.objects.filter(status='PENDING').count()
-    total_ai_agents = AIAgentConfig.objects.count()
+    stats = cache.get_or_set(DASHBOARD_STATS_CACHE_KEY, _get_dashboard_stats, ADMIN_STATS_CACHE_TIMEOUT)
     
     # Recent 5 users
     recent_users = CustomUser.objects.select_related('profile').order_by('-date_joined')[:5]
 
     context = {
-        'total_users': total_users,
-        'new_users_today': new_users_today,
-        'pending_kyc': pending_kyc,
-        'pending_payments': pending_payments,
-        'total_ai_agents': total_ai_agents,
+        **stats,
         'recent_users': recent_users,
-        'active_subscriptions': UserProfile.objects.filter(subscription_expiry__gt=timezone.now()).count()
     }
     return render(request, 'custom_admin/dashboard.html', context)
 
@@ -68,7 +104,7 @@ def admin_user_list(request):
         users = users.filter(profile__kyc_status='PENDING')
 
     # Pagination — 20 users per page
-    paginator = Paginator(users, 20)
+    paginator = EstimatedCountPaginator(users, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
@@ -105,7 +141,11 @@ def admin_user_detail(request, user_id):
             if days > 0:
                 profile.subscription_expiry = timezone.now() + timezone.timedelta(days=days)
                 profile.package_name = f"{days} Days Package"
-                profile.save()
+                # Targeted UPDATE of just the changed columns
+                UserProfile.objects.filter(pk=profile.pk).update(
+                    subscription_expiry=profile.subscription_expiry,
+                    package_name=profile.package_name,
+                )
                 
                 # Log history
                 from .models import SubscriptionHistory
@@ -121,10 +161,11 @@ def admin_user_detail(request, user_id):
              profile.name = request.POST.get('name', profile.name)
              profile.mobile_number = request.POST.get('mobile_number', profile.mobile_number)
              user.email = request.POST.get('email', user.email)
-             profile.save()
+             UserProfile.objects.filter(pk=profile.pk).update(name=profile.name, mobile_number=profile.mobile_number)
              user.save()
              messages.success(request, "User information updated.")
 
+        invalidate_admin_stats()
         return redirect('admin_user_detail', user_id=user_id)
         
     context = {
@@ -144,10 +185,19 @@ def admin_kyc_list(request):
     """
     kyc_requests = UserProfile.objects.filter(
         kyc_status='PENDING'
-    ).select_related('user').order_by('-user__date_joined')
+    ).select_related('user').only(
+        'id', 'name', 'mobile_number', 'profile_picture', 'kyc_front_image', 'kyc_back_image',
+        'user__email', 'user__date_joined',
+    ).order_by('-user__date_joined')
+
+    # Pagination — 50 requests per page
+    paginator = EstimatedCountPaginator(kyc_requests, 50)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
     
     context = {
-        'kyc_requests': kyc_requests
+        'kyc_requests': page_obj,
+        'page_obj': page_obj,
     }
     return render(request, 'custom_admin/kyc_list.html', context)
 
@@ -168,19 +218,26 @@ def admin_kyc_action(request):
         if action == 'approve':
             profile.kyc_status = 'VERIFIED'
             profile.kyc_rejection_reason = ''  # Clear any previous rejection reason
-            profile.save()
-            from .emails import send_kyc_approved_email
-            send_kyc_approved_email(profile)
+            UserProfile.objects.filter(pk=profile.pk).update(kyc_status='VERIFIED', kyc_rejection_reason='')
+            from .emails import build_kyc_approved_email, send_bulk_emails_in_background
+            email = build_kyc_approved_email(profile)
+            transaction.on_commit(lambda: send_bulk_emails_in_background([email]))
             messages.success(request, f"KYC for {profile.user.email} has been APPROVED.")
             
         elif action == 'reject':
             rejection_reason = request.POST.get('rejection_reason', '').strip()
             profile.kyc_status = 'REJECTED'
             profile.kyc_rejection_reason = rejection_reason or 'Your KYC submission did not meet our requirements. Please re-submit with clear images.'
-            profile.save()
-            from .emails import send_kyc_rejected_email
-            send_kyc_rejected_email(profile)
+            UserProfile.objects.filter(pk=profile.pk).update(
+                kyc_status='REJECTED',
+                kyc_rejection_reason=profile.kyc_rejection_reason,
+            )
+            from .emails import build_kyc_rejected_email, send_bulk_emails_in_background
+            email = build_kyc_rejected_email(profile)
+            transaction.on_commit(lambda: send_bulk_emails_in_background([email]))
             messages.warning(request, f"KYC for {profile.user.email} has been REJECTED.")
+
+        invalidate_admin_stats()
             
     return redirect('admin_kyc_list')
 
@@ -198,13 +255,7 @@ def admin_subscription_list(request):
     profiles = UserProfile.objects.select_related('user').all().order_by('-subscription_expiry')
 
     # Stats
-    total_active = UserProfile.objects.filter(subscription_expiry__gt=now).count()
-    expiring_soon = UserProfile.objects.filter(
-        subscription_expiry__gt=now,
-        subscription_expiry__lte=now + timezone.timedelta(days=7)
-    ).count()
-    total_expired = UserProfile.objects.filter(subscription_expiry__lte=now).count()
-    never_subscribed = UserProfile.objects.filter(subscription_expiry__isnull=True).count()
+    stats = cache.get_or_set(SUBSCRIPTION_STATS_CACHE_KEY, _get_subscription_stats, ADMIN_STATS_CACHE_TIMEOUT)
 
     # Search
     if query:
@@ -228,7 +279,7 @@ def admin_subscription_list(request):
         profiles = profiles.filter(subscription_expiry__isnull=True)
 
     # Pagination
-    paginator = Paginator(profiles, 20)
+    paginator = EstimatedCountPaginator(profiles, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
@@ -245,7 +296,10 @@ def admin_subscription_list(request):
                 # Start fresh from now
                 target_profile.subscription_expiry = now + timezone.timedelta(days=days)
             target_profile.package_name = f"{days} Days Package"
-            target_profile.save()
+            UserProfile.objects.filter(pk=target_profile.pk).update(
+                subscription_expiry=target_profile.subscription_expiry,
+                package_name=target_profile.package_name,
+            )
 
             from .models import SubscriptionHistory
             SubscriptionHistory.objects.create(
@@ -253,16 +307,17 @@ def admin_subscription_list(request):
                 package_name=f"{days} Days Package - Admin Assigned",
                 expiry_date=target_profile.subscription_expiry
             )
+            invalidate_admin_stats()
             messages.success(request, f"Subscription for {target_profile.user.email} extended by {days} days.")
             return redirect(f"{request.path}?status={status_filter}&q={query}")
 
     context = {
         'profiles': page_obj,
         'page_obj': page_obj,
-        'total_active': total_active,
-        'expiring_soon': expiring_soon,
-        'total_expired': total_expired,
-        'never_subscribed': never_subscribed,
+        'total_active': stats['total_active'],
+        'expiring_soon': stats['expiring_soon'],
+        'total_expired': stats['total_expired'],
+        'never_subscribed': stats['never_subscribed'],
         'status_filter': status_filter,
         'query': query,
     }
@@ -293,7 +348,7 @@ def admin_payment_list(request):
     pending_count = PaymentRequest.objects.filter(status='PENDING').count()
     approved_count = PaymentRequest.objects.filter(status='APPROVED').count()
 
-    paginator = Paginator(payments, 20)
+    paginator = EstimatedCountPaginator(payments, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
@@ -329,18 +384,14 @@ def admin_payment_action(request):
             from django.utils import timezone
             from datetime import timedelta
             from .models import SubscriptionHistory
-            from .emails import send_payment_approved_email
+            from .emails import build_payment_approved_email, send_bulk_emails_in_background
 
             payment.status = 'APPROVED'
             payment.save()
 
             now = timezone.now()
             profile = payment.user.profile
-            days = 0
-            if '15' in payment.package_name:
-                days = 15
-            elif '30' in payment.package_name:
-                days = 30
+            days = PaymentRequest.PACKAGE_DAYS.get(payment.package_name, 0)
             
             if days > 0:
                 if profile.subscription_expiry and profile.subscription_expiry > now:
@@ -358,19 +409,32 @@ def admin_payment_action(request):
                     expiry_date=new_expiry
                 )
             
-            send_payment_approved_email(payment)
+            email = build_payment_approved_email(payment)
+            transaction.on_commit(lambda: send_bulk_emails_in_background([email]))
             messages.success(request, f"Payment for {payment.user.email} APPROVED. Subscription extended.")
             
         elif action == 'reject':
-            from .emails import send_payment_rejected_email
+            from .emails import build_payment_rejected_email, send_bulk_emails_in_background
             payment.status = 'REJECTED'
             payment.save()
-            send_payment_rejected_email(payment)
+            email = build_payment_rejected_email(payment)
+            transaction.on_commit(lambda: send_bulk_emails_in_background([email]))
             messages.warning(request, f"Payment for {payment.user.email} REJECTED.")
+
+        invalidate_admin_stats()
             
     return redirect('admin_payment_list')
 
 
+def _split_series(rows):
+    """Split (label, value) rows into the parallel label/value lists Chart.js expects, in one pass."""
+    labels, values = [], []
+    for label, value in rows:
+        labels.append(label)
+        values.append(value)
+    return labels, values
+
+
 @login_required
 @user_passes_test(is_superuser)
 def admin_analytics(request):
@@ -388,43 +452,40 @@ def admin_analytics(request):
         .annotate(date=TruncDate('date_joined')) \
         .values('date') \
         .annotate(count=Count('id')) \
-        .order_by('date')
+        .order_by('date') \
+        .values_list('date', 'count')
     
-    dates_users = [item['date'].strftime('%b %d') for item in daily_users]
-    counts_users = [item['count'] for item in daily_users]
+    dates_users, counts_users = _split_series(
+        (date.strftime('%b %d'), count) for date, count in daily_users
+    )
     
     # 3. Revenue Over Time (last 30 days)
     daily_revenue = PaymentRequest.objects.filter(status='APPROVED', created_at__gte=thirty_days_ago) \
         .annotate(date=TruncDate('created_at')) \
         .values('date') \
         .annotate(total=Sum('amount')) \
-        .order_by('date')
+        .order_by('date') \
+        .values_list('date', 'total')
         
-    dates_revenue = [item['date'].strftime('%b %d') for item in daily_revenue]
-    amounts_revenue = [float(item['total']) for item in daily_revenue]
+    dates_revenue, amounts_revenue = _split_series(
+        (date.strftime('%b %d'), float(total)) for date, total in daily_revenue
+    )
     
     # 4. KYC Conversion
-    kyc_stats = UserProfile.objects.values('kyc_status').annotate(count=Count('id'))
-    kyc_labels = []
-    kyc_data = []
-    for stat in kyc_stats:
-        status = stat['kyc_status']
-        if not status: status = 'UNVERIFIED'
-        kyc_labels.append(status)
-        kyc_data.append(stat['count'])
+    kyc_stats = UserProfile.objects.values('kyc_status').annotate(count=Count('id')).values_list('kyc_status', 'count')
+    kyc_labels, kyc_data = _split_series(
+        (status or 'UNVERIFIED', count) for status, count in kyc_stats
+    )
         
     # 5. Subscriptions by Package (Active)
     package_stats = UserProfile.objects.filter(subscription_expiry__gt=now) \
         .values('package_name') \
-        .annotate(count=Count('id'))
+        .annotate(count=Count('id')) \
+        .values_list('package_name', 'count')
     
-    package_labels = []
-    package_data = []
-    for stat in package_stats:
-        name = stat['package_name']
-        if not name: name = 'Free Trial'
-        package_labels.append(name)
-        package_data.append(stat['count'])
+    package_labels, package_data = _split_series(
+        (name or 'Free Trial', count) for name, count in package_stats
+    )
         
     context = {
         'total_revenue': total_revenue,
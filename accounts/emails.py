@@ -2,19 +2,20 @@
 Email helper functions for Page Pilot.
 Sends HTML emails for welcome, KYC, and subscription events.
 """
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.html import strip_tags
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 
-def _send_email(subject, template_name, context, recipient_email):
+def _build_email(subject, template_name, context, recipient_email):
     """
-    Internal helper — renders an HTML template and sends it.
-    Silently logs errors so email failures never break the app.
+    Internal helper — renders an HTML template into a message without sending it.
+    Returns None (and logs) if rendering fails.
     """
     try:
         context.setdefault('site_url', settings.SITE_URL)
@@ -30,14 +31,73 @@ def _send_email(subject, template_name, context, recipient_email):
             to=[recipient_email],
         )
         msg.attach_alternative(html_content, 'text/html')
+        return msg
+    except Exception as e:
+        logger.error(f'Email build failed: "{subject}" → {recipient_email}: {e}')
+        return None
+
+
+def _send_message(msg):
+    """
+    Internal helper — sends a single pre-built message.
+    Silently logs errors so email failures never break the app.
+    """
+    if msg is None:
+        return False
+    try:
         msg.send(fail_silently=False)
-        logger.info(f'Email sent: "{subject}" → {recipient_email}')
+        logger.info(f'Email sent: "{msg.subject}" → {", ".join(msg.to)}')
         return True
     except Exception as e:
-        logger.error(f'Email failed: "{subject}" → {recipient_email}: {e}')
+        logger.error(f'Email failed: "{msg.subject}" → {", ".join(msg.to)}: {e}')
         return False
 
 
+def _send_email(subject, template_name, context, recipient_email):
+    """
+    Internal helper — renders an HTML template and sends it.
+    Silently logs errors so email failures never break the app.
+    """
+    return _send_message(_build_email(subject, template_name, context, recipient_email))
+
+
+def send_bulk_emails(messages):
+    """
+    Send pre-built messages over a single SMTP connection.
+    Used by bulk admin actions so N emails cost one handshake instead of N.
+    Each message is sent on its own, so one refused recipient doesn't stop the rest.
+    Returns the number of messages sent; errors are logged, never raised.
+    """
+    messages = [msg for msg in messages if msg is not None]
+    if not messages:
+        return 0
+    sent = 0
+    try:
+        with get_connection() as connection:
+            for msg in messages:
+                msg.connection = connection
+                if _send_message(msg):
+                    sent += 1
+    except Exception as e:
+        # Opening or closing the shared connection failed
+        logger.error(f'Bulk email connection failed: {e}')
+    logger.info(f'Bulk email: {sent}/{len(messages)} sent')
+    return sent
+
+
+def send_bulk_emails_in_background(messages):
+    """
+    Send pre-built messages from a background thread so the admin request never waits on SMTP.
+    Messages are rendered by the caller, so the thread does no database work.
+    The thread is non-daemon: on a graceful worker shutdown the interpreter waits for
+    in-flight emails to finish instead of dropping them.
+    """
+    messages = [msg for msg in messages if msg is not None]
+    if not messages:
+        return
+    threading.Thread(target=send_bulk_emails, args=(messages,), daemon=False).start()
+
+
 def send_welcome_email(user):
     """Send welcome email after successful registration."""
     return _send_email(
@@ -51,9 +111,9 @@ def send_welcome_email(user):
     )
 
 
-def send_kyc_approved_email(profile):
-    """Send email when KYC is approved."""
-    return _send_email(
+def build_kyc_approved_email(profile):
+    """Build (but don't send) the KYC approved email."""
+    return _build_email(
         subject=f'KYC Verified — You\'re All Set! ✅',
         template_name='emails/kyc_approved.html',
         context={
@@ -63,9 +123,9 @@ def send_kyc_approved_email(profile):
     )
 
 
-def send_kyc_rejected_email(profile):
-    """Send email when KYC is rejected, including the reason."""
-    return _send_email(
+def build_kyc_rejected_email(profile):
+    """Build (but don't send) the KYC rejected email."""
+    return _build_email(
         subject=f'KYC Submission Update — Action Required',
         template_name='emails/kyc_rejected.html',
         context={
@@ -91,10 +151,10 @@ def send_subscription_expiry_warning(profile, days_remaining):
     )
 
 
-def send_payment_approved_email(payment_request):
-    """Send email when a payment request is approved."""
+def build_payment_approved_email(payment_request):
+    """Build (but don't send) the payment approved email."""
     profile = payment_request.user.profile
-    return _send_email(
+    return _build_email(
         subject=f'Payment Approved — Subscription Upgraded! 🎉',
         template_name='emails/payment_approved.html',
         context={
@@ -106,10 +166,10 @@ def send_payment_approved_email(payment_request):
     )
 
 
-def send_payment_rejected_email(payment_request):
-    """Send email when a payment request is rejected."""
+def build_payment_rejected_email(payment_request):
+    """Build (but don't send) the payment rejected email."""
     profile = payment_request.user.profile
-    return _send_email(
+    return _build_email(
         subject=f'Payment Rejected — Action Required',
         template_name='emails/payment_rejected.html',
         context={
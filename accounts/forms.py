@@ -153,10 +153,9 @@ class PaymentRequestForm(forms.ModelForm):
         model = PaymentRequest
         fields = ['package_name', 'payment_method', 'transaction_id']
         widgets = {
-            'package_name': forms.Select(choices=[
-                ('', 'Select Package'),
-                ('15 Days Package', '15 Days Package (2,500 BDT)'),
-                ('30 Days Package', '30 Days Package (3,000 BDT)')
+            'package_name': forms.Select(choices=[('', 'Select Package')] + [
+                (name, f"{name} ({package['price']:,} BDT)")
+                for name, package in PaymentRequest.PACKAGES.items()
             ], attrs={
                 'class': 'w-full px-4 py-3 rounded-lg border border-gray-300 focus:border-blue-500 focus:ring-2 focus:ring-blue-200 transition duration-200 bg-white mb-2'
             }),
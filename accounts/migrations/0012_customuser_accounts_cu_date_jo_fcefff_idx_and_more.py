@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_paymentrequest'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['date_joined'], name='accounts_cu_date_jo_fcefff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentrequest',
+            index=models.Index(fields=['status', 'created_at'], name='accounts_pa_status_249125_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_customuser_accounts_cu_date_jo_fcefff_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['kyc_status'], name='accounts_us_kyc_sta_0b1856_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['subscription_expiry'], name='accounts_us_subscri_d9beb5_idx'),
+        ),
+    ]
@@ -35,6 +35,11 @@ class CustomUser(AbstractUser):
     REQUIRED_FIELDS = []
     
     objects = CustomUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['date_joined']),  # analytics growth chart / "new today" stat
+        ]
     
     def __str__(self):
         return self.email
@@ -84,6 +89,12 @@ class UserProfile(models.Model):
             return True # Allow access if no expiry set (or change logic as needed)
         return timezone.now() < self.subscription_expiry
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['kyc_status']),  # pending KYC queue / dashboard count
+            models.Index(fields=['subscription_expiry']),  # active/expired subscription filters
+        ]
+
 
 class AIAgentConfig(models.Model):
     """AI Agent configuration for each user"""
@@ -142,6 +153,14 @@ class PaymentRequest(models.Model):
         ('REJECTED', 'Rejected'),
     )
 
+    # Purchasable packages: subscription days granted on approval and price in BDT.
+    # The wallet form's choices, the submitted amount and PACKAGE_DAYS all come from here.
+    PACKAGES = {
+        '15 Days Package': {'days': 15, 'price': 2500},
+        '30 Days Package': {'days': 30, 'price': 3000},
+    }
+    PACKAGE_DAYS = {name: package['days'] for name, package in PACKAGES.items()}
+
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='payment_requests')
     package_name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -157,4 +176,7 @@ class PaymentRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),  # analytics revenue chart
+        ]
 
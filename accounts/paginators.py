@@ -0,0 +1,46 @@
+"""
+Pagination helpers for the admin list pages.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips SELECT COUNT(*) on large, unfiltered tables.
+
+    When the queryset has no WHERE clause and the database is Postgres, the
+    planner's row estimate (pg_class.reltuples) is used as the total instead.
+    Filtered querysets, other databases and small tables get an exact count.
+    """
+    # Below this many rows an exact COUNT is cheap, so keep page numbers exact
+    min_estimate = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is not None and estimate >= self.min_estimate:
+            return estimate
+        return super().count
+
+    def _estimated_count(self):
+        """Return the Postgres row estimate for an unfiltered queryset, else None."""
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where or query.distinct or query.is_sliced:
+            return None
+
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        # Resolve the table through regclass so it follows search_path instead of
+        # matching a same-named table in another schema
+        table = connection.ops.quote_name(self.object_list.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
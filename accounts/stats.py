@@ -0,0 +1,17 @@
+"""
+Cache keys and invalidation for the admin dashboard/subscription stats.
+"""
+from django.core.cache import cache
+
+# Admins can live with up to a minute of staleness on these counts.
+# No shared CACHES backend is configured, so each gunicorn worker keeps its own
+# LocMemCache copy: invalidation only clears the worker that handled the change,
+# and the timeout is the real bound on staleness for the others.
+DASHBOARD_STATS_CACHE_KEY = 'admin:dashboard_stats'
+SUBSCRIPTION_STATS_CACHE_KEY = 'admin:subscription_stats'
+ADMIN_STATS_CACHE_TIMEOUT = 60
+
+
+def invalidate_admin_stats():
+    """Best-effort drop of the cached stats after an admin changes data (current worker only)."""
+    cache.delete_many([DASHBOARD_STATS_CACHE_KEY, SUBSCRIPTION_STATS_CACHE_KEY])
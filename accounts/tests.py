@@ -1,3 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .admin import DEFAULT_KYC_REJECTION_REASON
+from .emails import send_bulk_emails
+from .models import CustomUser, PaymentRequest, SubscriptionHistory, UserProfile
+
+
+# Send the actions' emails inline so mail.outbox is filled by the time the action returns
+@mock.patch('accounts.admin.send_bulk_emails_in_background', send_bulk_emails)
+class AdminActionTests(TestCase):
+    def setUp(self):
+        admin_user = CustomUser.objects.create_superuser(email='admin@example.com', password='pass')
+        self.client.force_login(admin_user)
+
+    def create_profile(self, email, **fields):
+        user = CustomUser.objects.create_user(email=email, password='pass')
+        return UserProfile.objects.create(user=user, name=email.split('@')[0], **fields)
+
+    def run_action(self, model, action, objects):
+        """POST an admin changelist action, running its on_commit callbacks."""
+        url = reverse(f'admin:accounts_{model._meta.model_name}_changelist')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {
+                'action': action,
+                '_selected_action': [obj.pk for obj in objects],
+            })
+        self.assertEqual(response.status_code, 302)
+
+    def test_approve_payment_stacks_payments_for_same_user(self):
+        profile = self.create_profile('buyer@example.com')
+        older = PaymentRequest.objects.create(
+            user=profile.user, package_name='30 Days Package', amount=3000,
+            payment_method='BKASH', transaction_id='TX-1',
+        )
+        newer = PaymentRequest.objects.create(
+            user=profile.user, package_name='15 Days Package', amount=2500,
+            payment_method='NAGAD', transaction_id='TX-2',
+        )
+        # Pin the order: payments are processed newest first, so the older one is applied last
+        PaymentRequest.objects.filter(pk=older.pk).update(created_at=timezone.now() - timedelta(hours=1))
+
+        before = timezone.now()
+        self.run_action(PaymentRequest, 'approve_payment', [older, newer])
+
+        profile.refresh_from_db()
+        self.assertAlmostEqual(
+            profile.subscription_expiry, before + timedelta(days=45), delta=timedelta(minutes=1),
+        )
+        self.assertEqual(profile.package_name, '30 Days Package')
+        self.assertFalse(PaymentRequest.objects.exclude(status='APPROVED').exists())
+
+        histories = SubscriptionHistory.objects.filter(profile=profile).order_by('expiry_date')
+        self.assertEqual(
+            [history.package_name for history in histories], ['15 Days Package', '30 Days Package'],
+        )
+        self.assertEqual(histories.last().expiry_date, profile.subscription_expiry)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_approve_payment_skips_processed_payments(self):
+        profile = self.create_profile('buyer@example.com')
+        payment = PaymentRequest.objects.create(
+            user=profile.user, package_name='30 Days Package', amount=3000,
+            payment_method='BKASH', transaction_id='TX-1', status='APPROVED',
+        )
+
+        self.run_action(PaymentRequest, 'approve_payment', [payment])
+
+        profile.refresh_from_db()
+        self.assertIsNone(profile.subscription_expiry)
+        self.assertFalse(SubscriptionHistory.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_reject_kyc_backfills_default_reason(self):
+        blank = self.create_profile('blank@example.com', kyc_status='PENDING')
+        explained = self.create_profile(
+            'explained@example.com', kyc_status='PENDING', kyc_rejection_reason='Image is blurry.',
+        )
+
+        self.run_action(UserProfile, 'reject_kyc', [blank, explained])
+
+        blank.refresh_from_db()
+        explained.refresh_from_db()
+        self.assertEqual(blank.kyc_status, 'REJECTED')
+        self.assertEqual(blank.kyc_rejection_reason, DEFAULT_KYC_REJECTION_REASON)
+        self.assertEqual(explained.kyc_status, 'REJECTED')
+        self.assertEqual(explained.kyc_rejection_reason, 'Image is blurry.')
 
-# Create your tests here.
+        bodies = {message.to[0]: message.body for message in mail.outbox}
+        self.assertEqual(len(bodies), 2)
+        self.assertIn(DEFAULT_KYC_REJECTION_REASON, bodies['blank@example.com'])
+        self.assertIn('Image is blurry.', bodies['explained@example.com'])
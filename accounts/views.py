@@ -530,12 +530,8 @@ def wallet_view(request):
             payment_request = form.save(commit=False)
             payment_request.user = request.user
             # Automatically set the amount based on selected package
-            if payment_request.package_name == '15 Days Package':
-                payment_request.amount = 2500.00
-            elif payment_request.package_name == '30 Days Package':
-                payment_request.amount = 3000.00
-            else:
-                payment_request.amount = 0.00
+            package = PaymentRequest.PACKAGES.get(payment_request.package_name)
+            payment_request.amount = package['price'] if package else 0.00
             
             payment_request.save()
             messages.success(request, 'Payment request submitted successfully! It is now pending admin approval.')
@@ -189,6 +189,7 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))   # must be int, not string
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = True
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))   # seconds; a hung SMTP server must not pin the (non-daemon) send thread
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
 # Site info (used in email templates)